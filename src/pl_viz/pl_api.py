@@ -1,13 +1,156 @@
-from typing import List, Optional, Dict, Union
+from typing import Any, List, Optional, Dict, Protocol, Set, Tuple, Union
 import requests
-import altair as alt
-import pandas as pd
-import statistics
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import orjson
+import threading
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ["Course", "Assessment", "Student", "enable_response_cache", "invalidate_cache"]
+
+# Guards the shared global_students / global_assessments registries, which may be
+# filled from several threads at once (see utils.fetch_data)
+_registry_lock = threading.Lock()
+
+# Gradebook fields passed positionally to Student
+_STUDENT_FIELDS = itemgetter("user_id", "user_name", "user_uid")
+
+# Shared session so every API call reuses pooled keep-alive connections instead of
+# paying a fresh TCP + TLS handshake. Rate limiting and transient server errors are
+# retried with backoff (honouring Retry-After); after that the response is
+# returned so callers can report the status.
+def _configure_session(session: requests.Session) -> requests.Session:
+    """Mount the pooled, retrying adapter on a session."""
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+    ))
+    return session
+
+
+class _HTTPClient(Protocol):
+    """Any client with a requests-style `get`, such as `requests.Session` or `httpx.Client`."""
+
+    def get(self, url: str, *, headers: Dict[str, str], timeout: float) -> Any: ...
+
+
+_API_BASE_URL = "https://us.prairielearn.com/pl/api/v1"
+_SESSION = _configure_session(requests.Session())
+_TIMEOUT = 30
+
+# Last successful response per (url, token) that carried an ETag, replayed when
+# the server answers a conditional request with 304 Not Modified. Only the
+# per-course list endpoints are requested conditionally, which keeps it small.
+_etag_responses: Dict[Tuple[str, str], requests.Response] = {}
+
+
+def _get(url: str, token: str, session: Optional[_HTTPClient] = None, conditional: bool = False) -> requests.Response:
+    """Send an authenticated GET request to the PrairieLearn API.
+
+    With `conditional` set, a response carrying an ETag is kept, and the next
+    request for the same URL and token is made conditional. A 304 Not Modified
+    reply is then answered with the kept response, so unchanged payloads are not
+    downloaded again.
+
+    Parameters
+    ----------
+    url : str
+        The API endpoint to request.
+    token : str
+        Authentication token sent as the Private-Token header.
+    session : requests.Session or compatible client, optional
+        Client to send the request with, default is the shared module session.
+    conditional : bool, optional
+        Revalidate the response with its ETag on later requests, default is False.
+
+    Returns
+    -------
+    requests.Response
+        The response, with the cached 200 response substituted for a 304.
+    """
+    headers = {"Private-Token": token}
+    cached = _etag_responses.get((url, token)) if conditional else None
+    if cached is not None:
+        headers["If-None-Match"] = cached.headers["ETag"]
+
+    response = (session if session is not None else _SESSION).get(url, headers=headers, timeout=_TIMEOUT)
+
+    if response.status_code == 304 and cached is not None:
+        return cached
+    if conditional and response.status_code == 200 and "ETag" in response.headers:
+        _etag_responses[(url, token)] = response
+    return response
+
+
+def _grade_record(course: 'Course', assessment: Dict) -> Dict[str, Union[str, int, float]]:
+    """Flatten one gradebook assessment entry into a record for `Student.grades`."""
+    return {
+        "course_code": course.course_code,
+        "course_id": course.course_id,
+        "points": assessment["points"],
+        "max_points": assessment["max_points"],
+        "score_perc": assessment["score_perc"],
+        "start_date": assessment["start_date"],
+        "duration_seconds": assessment["duration_seconds"],
+        "assessment_id": assessment["assessment_id"],
+        "assessment_name": assessment["assessment_name"],
+        "assessment_label": assessment["assessment_label"],
+    }
+
+
+def enable_response_cache(cache_name: str = "pl_api_cache", expire_after: int = 600) -> None:
+    """Cache API responses on disk so repeated fetches skip the network.
+
+    Requires the optional `requests-cache` package (``pip install "pl_viz[cache]"``).
+    Assessment lists are kept for a day; gradebooks and submissions for
+    `expire_after` seconds. The cache holds student names and grades, so keep
+    the cache file private.
+
+    Parameters
+    ----------
+    cache_name : str, optional
+        Path of the SQLite cache file, default is 'pl_api_cache'.
+    expire_after : int, optional
+        Seconds before a cached gradebook or submission list expires, default is 600.
+    """
+    global _SESSION
+    import requests_cache
+
+    _SESSION = _configure_session(requests_cache.CachedSession(
+        cache_name,
+        backend="sqlite",
+        expire_after=expire_after,
+        allowable_methods=("GET",),
+        urls_expire_after={"*/assessment_instances": expire_after, "*/assessments": 86400},
+    ))
+
+
+def invalidate_cache() -> None:
+    """Discard the HTTP-level caches: the on-disk response cache and stored ETags.
+
+    Data already held by `Course`, `Assessment` and `Student` objects is kept. Use
+    `Course.invalidate_submission_cache`, `Assessment.fetch_submissions(refresh=True)`
+    or `Course.get_gradebook(refresh=True)` to download it again.
+    """
+    _etag_responses.clear()
+    if hasattr(_SESSION, "cache"):
+        _SESSION.cache.clear()
 
 class Course:
     """A class to represent a course."""
 
-    def __init__(self, course_code: str, course_id: int, token: str):
+    _GRADEBOOK_URL = _API_BASE_URL + "/course_instances/{}/gradebook"
+    _ASSESSMENTS_URL = _API_BASE_URL + "/course_instances/{}/assessments"
+
+    __slots__ = (
+        "course_code", "course_id", "students", "assessments", "token", "session",
+        "_gradebook", "_gradebook_by_user",
+    )
+
+    def __init__(self, course_code: str, course_id: int, token: str, session: Optional[_HTTPClient] = None):
         """
         Initialize a Course instance.
 
@@ -19,52 +162,92 @@ class Course:
             The unique identifier for the course.
         token : str
             Authentication token for the course.
+        session : requests.Session or compatible client, optional
+            Client used for this course's API requests and inherited by its assessments.
+            Any object with a requests-style `get`, such as `httpx.Client`, works.
+            By default the shared module session is used.
         """
         self.course_code: str = course_code
         self.course_id: int = course_id
         self.students: List['Student'] = []
         self.assessments: List['Assessment'] = []
         self.token: str = token
+        self.session: Optional[_HTTPClient] = session
+        self._gradebook: Optional[List[Dict]] = None
+        self._gradebook_by_user: Optional[Dict[int, List[Dict]]] = None
 
-    def fetch_students(self, global_students: Optional[Dict[int, 'Student']] = None) -> None:
-        """Fetch all students in the course and populate the `students` list.
+    def get_gradebook(self, refresh: bool = False) -> List[Dict]:
+        """Return the course gradebook, downloading it only once.
+
+        Also indexes each student's gradebook assessments by user ID, so
+        `Student.fetch_all_grades` can look them up without another request.
 
         Parameters
         ----------
-        global_students : dict, optional
-            A dictionary to map global student instances for reuse.
+        refresh : bool, optional
+            Re-fetch the gradebook even if it was already fetched, default is False.
+
+        Returns
+        -------
+        list of dict
+            One gradebook row per student, including their assessments.
+
+        Raises
+        ------
+        ValueError
+            If the API request fails.
         """
-        url = f"https://us.prairielearn.com/pl/api/v1/course_instances/{self.course_id}/gradebook"
-        headers = {"Private-Token": self.token}
-        response = requests.get(url, headers=headers)
+        if self._gradebook is None or refresh:
+            url = self._GRADEBOOK_URL.format(self.course_id)
+            response = _get(url, self.token, self.session, conditional=True)
 
-        if response.status_code == 200:
-            gradebook_data = response.json()
+            if response.status_code != 200:
+                raise ValueError(f"Failed to fetch gradebook for course {self.course_id}. Status Code: {response.status_code}")
 
-            for student in gradebook_data:
+            gradebook_data = orjson.loads(response.content)
+            self._gradebook_by_user = {student["user_id"]: student["assessments"] for student in gradebook_data}
+            self._gradebook = gradebook_data
 
-                student_id = student["user_id"]
-                name = student["user_name"]
-                email = student["user_uid"]
+        return self._gradebook
 
-                # Create or retrieve the student instance
-                if global_students is not None:
-                    if student_id not in global_students:
-                        student_instance = Student(student_id, name, email, self.token)
-                        global_students[student_id] = student_instance
-                    else:
-                        student_instance = global_students[student_id]
-                else:
-                    student_instance = Student(student_id, name, email, self.token)
+    def fetch_students(self, global_students: Optional[Dict[int, 'Student']] = None) -> None:
+        """Fetch all students in the course and populate the `students` list.
 
-                # Add course to the student and append to the course's student list
+        Parameters
+        ----------
+        global_students : dict, optional
+            A dictionary to map global student instances for reuse.
+
+        Raises
+        ------
+        ValueError
+            If the API request fails.
+        """
+        gradebook_data = self.get_gradebook(refresh=True)
+
+        if global_students is None:
+            # Reuse instances from an earlier fetch of this course
+            global_students = {student.user_id: student for student in self.students}
+
+        # (user_id, user_name, user_uid) tuples, extracted by itemgetter in C
+        student_rows = list(map(_STUDENT_FIELDS, gradebook_data))
+        token = self.token
+
+        with _registry_lock:
+            # Create instances only for students not seen before and register them in one step
+            global_students.update({
+                row[0]: Student(*row, token)
+                for row in student_rows
+                if row[0] not in global_students
+            })
+            self.students = [global_students[row[0]] for row in student_rows]
+
+            # Add course to each student
+            for student_instance in self.students:
                 student_instance.add_course(self)
-                self.students.append(student_instance)
 
-            # Print the number of students fetched
-            print(f"\nFetched {len(self.students)} students for course code {self.course_code}.")
-        else:
-            raise ValueError(f"Failed to fetch students. Status Code: {response.status_code}")
+        # Print the number of students fetched
+        print(f"\nFetched {len(self.students)} students for course code {self.course_code}.")
 
     def fetch_assessments(self, global_assessments: Optional[Dict[int, 'Assessment']] = None) -> None:
         """Fetch all assessments in the course and populate the `assessments` list.
@@ -74,12 +257,20 @@ class Course:
         global_assessments : dict, optional
             A dictionary to map global assessment instances for reuse.
         """
-        url = f"https://us.prairielearn.com/pl/api/v1/course_instances/{self.course_id}/assessments"
-        headers = {"Private-Token": self.token}
-        response = requests.get(url, headers=headers)
+        url = self._ASSESSMENTS_URL.format(self.course_id)
+        response = _get(url, self.token, self.session, conditional=True)
 
         if response.status_code == 200:
-            assessments_data = response.json()
+            assessments_data = orjson.loads(response.content)
+
+            # Reuse instances from an earlier fetch, keyed by ID, so re-fetching neither
+            # duplicates assessments nor drops their cached submissions
+            known_assessments = {assessment.assessment_id: assessment for assessment in self.assessments}
+            assessments = []
+
+            # Bind loop invariants locally to avoid repeated attribute lookups per row
+            append = assessments.append
+            course_id, token, session = self.course_id, self.token, self.session
 
             for assessment in assessments_data:
 
@@ -91,190 +282,402 @@ class Course:
 
                 # Create or retrieve the assessment instance
                 if global_assessments is not None:
-                    if assessment_id not in global_assessments:
-                        global_assessments[assessment_id] = Assessment(
-                            assessment_id, assessment_name, assessment_label, assessment_set_name, assessment_set_heading, self.course_id, self.token
-                        )
-                    assessment_instance = global_assessments[assessment_id]
+                    with _registry_lock:
+                        assessment_instance = global_assessments.get(assessment_id)
+                        if assessment_instance is None:
+                            assessment_instance = Assessment(
+                                assessment_id, assessment_name, assessment_label, assessment_set_name, assessment_set_heading, course_id, token, session
+                            )
+                            global_assessments[assessment_id] = assessment_instance
                 else:
-                    assessment_instance = Assessment(
-                        assessment_id, assessment_name, assessment_label, assessment_set_name, assessment_set_heading, self.course_id, self.token
-                    )
+                    assessment_instance = known_assessments.get(assessment_id)
+                    if assessment_instance is None:
+                        assessment_instance = Assessment(
+                            assessment_id, assessment_name, assessment_label, assessment_set_name, assessment_set_heading, course_id, token, session
+                        )
 
                 # Append to the course's assessments list
-                self.assessments.append(assessment_instance)
+                append(assessment_instance)
+
+            self.assessments = assessments
 
-            # Print each assessment name on a new line
-            print("Fetched assessments:")
-            for assessment in self.assessments:
-                print(f"- {assessment.name} (Label: {assessment.label})")
+            # Print each assessment name on a new line, in a single call so output
+            # from concurrent fetches does not interleave
+            lines = [f"- {assessment.name} (Label: {assessment.label})" for assessment in self.assessments]
+            print("Fetched assessments:\n" + "\n".join(lines))
         else:
             raise ValueError(f"Failed to fetch assessments. Status Code: {response.status_code}")
 
+    def bootstrap(self, global_students: Optional[Dict[int, 'Student']] = None, global_assessments: Optional[Dict[int, 'Assessment']] = None) -> None:
+        """Fetch the students and assessments of the course concurrently.
+
+        The gradebook and assessment requests are independent and fill disjoint
+        attributes, so issuing them together takes about one round-trip instead of two.
+
+        Parameters
+        ----------
+        global_students : dict, optional
+            A dictionary to map global student instances for reuse.
+        global_assessments : dict, optional
+            A dictionary to map global assessment instances for reuse.
+
+        Raises
+        ------
+        ValueError
+            If either API request fails.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            students = executor.submit(self.fetch_students, global_students)
+            assessments = executor.submit(self.fetch_assessments, global_assessments)
+
+        students.result()
+        assessments.result()
+
+    def populate_student_grades(self, students_by_id: Optional[Dict[int, 'Student']] = None) -> None:
+        """Fill in the grades of many students from one pass over the gradebook.
+
+        The gradebook is downloaded at most once, and each row is dispatched to
+        its student, replacing any grades that student already had for this course.
+
+        Parameters
+        ----------
+        students_by_id : dict, optional
+            Students to update, keyed by user ID. Defaults to the students of this course.
+
+        Raises
+        ------
+        ValueError
+            If the gradebook cannot be fetched.
+        """
+        if students_by_id is None:
+            students_by_id = {student.user_id: student for student in self.students}
+
+        for row in self.get_gradebook():
+            student = students_by_id.get(row["user_id"])
+            if student is None:
+                continue
+
+            student.add_course(self)
+            other_grades = [grade for grade in student.grades if grade["course_id"] != self.course_id]
+            student.grades = other_grades + [_grade_record(self, assessment) for assessment in row["assessments"]]
+
     def show_student_list(self) -> None:
         """Show the list of students enrolled in the course."""
         if not self.students:
             self.fetch_students()
             
-        print(f"\nThere are {len(self.students)} students in Course {self.course_code}:")
+        # Write the whole list in one call rather than one print per student
+        lines = [f"\nThere are {len(self.students)} students in Course {self.course_code}:"]
+        lines.extend(
+            f"User ID: {student.user_id}, User Name: {student.user_name}, User UID: {student.user_uid}"
+            for student in self.students
+        )
+        print("\n".join(lines))
 
-        for student in self.students:
-            print(f"User ID: {student.user_id}, User Name: {student.user_name}, User UID: {student.user_uid}")
+    def invalidate_submission_cache(self) -> None:
+        """Forget the fetched submissions and scores of every assessment in the course.
+
+        The next call that needs submissions, such as a plot or the summary
+        statistics, downloads them again.
+        """
+        for assessment in self.assessments:
+            assessment.invalidate_submission_cache()
 
     def get_assessment_summary_statistics(self) -> None:
         """Compute and print summary statistics for each assessment in the course."""
         if not self.assessments:
             self.fetch_assessments()
 
-        print("\nAssessment Summary Statistics:")
-        for assessment in self.assessments:
-            # Fetch submissions for the assessment
-            assessment.fetch_submissions()
-
-            # Get summary statistics using the Assessment class method
-            stats = assessment.get_summary_statistics()
+        # A failed fetch is reported for its assessment instead of aborting the others
+        errors = self._fetch_submissions_parallel(self.assessments)
+
+        score_matrix = self._build_score_matrix()
+        counts = np.count_nonzero(~np.isnan(score_matrix), axis=1)
+
+        # Reduce every assessment that has scores at once, keyed by matrix row so
+        # skipping an assessment below cannot shift the others' statistics
+        scored_rows = np.flatnonzero(counts > 0)
+        row_stats = {}
+        if scored_rows.size:
+            scored = score_matrix[scored_rows]
+            row_stats = dict(zip(scored_rows.tolist(), zip(
+                np.nanmean(scored, axis=1),
+                np.nanmedian(scored, axis=1),
+                np.nanmax(scored, axis=1),
+                np.nanmin(scored, axis=1),
+            )))
+
+        # Collect the report and print it in one call
+        lines = ["\nAssessment Summary Statistics:"]
+        for row, (assessment, count) in enumerate(zip(self.assessments, counts)):
+            if errors[assessment] is not None:
+                lines.append(f"\nAssessment: {assessment.name} (Label: {assessment.label})")
+                lines.append(f"  - Could not fetch submissions: {errors[assessment]}")
+                continue
 
-            if stats == None:
-                print(f"\nNo submissions for Assessment: {assessment.name} (Label: {assessment.label})")
+            if count == 0:
+                lines.append(f"\nNo submissions for Assessment: {assessment.name} (Label: {assessment.label})")
                 continue
-            
-            print(f"\nAssessment: {assessment.name} (Label: {assessment.label})")
-            print(f"  - Number of submissions: {stats['num_submissions']}")
-            print(f"  - Mean score: {stats['mean_score']:.2f}%" if stats['mean_score'] is not None else "  - Mean score: N/A")
-            print(f"  - Median score: {stats['median_score']:.2f}%" if stats['median_score'] is not None else "  - Median score: N/A")
-            print(f"  - Max score: {stats['max_score']:.2f}%" if stats['max_score'] is not None else "  - Max score: N/A")
-            print(f"  - Min score: {stats['min_score']:.2f}%" if stats['min_score'] is not None else "  - Min score: N/A")
 
+            mean_score, median_score, max_score, min_score = row_stats[row]
+            lines.extend([
+                f"\nAssessment: {assessment.name} (Label: {assessment.label})",
+                f"  - Number of submissions: {count}",
+                f"  - Mean score: {mean_score:.2f}%",
+                f"  - Median score: {median_score:.2f}%",
+                f"  - Max score: {max_score:.2f}%",
+                f"  - Min score: {min_score:.2f}%",
+            ])
+
+        print("\n".join(lines))
+
+    def _select_assessments(self, assessment_label: Optional[Union[str, List[str]]] = None, assessment_name: Optional[Union[str, List[str]]] = None) -> List['Assessment']:
+        """Return the assessments matching either filter, or all of them if neither is given."""
+        if not assessment_label and not assessment_name:
+            return list(self.assessments)
+
+        if isinstance(assessment_label, str):
+            assessment_label = [assessment_label]
+        if isinstance(assessment_name, str):
+            assessment_name = [assessment_name]
+
+        # Sets make each membership test O(1) however many labels or names are passed
+        labels = frozenset(assessment_label or ())
+        names = frozenset(assessment_name or ())
+        return [
+            assessment for assessment in self.assessments
+            if assessment.label in labels or assessment.name in names
+        ]
+
+    def _fetch_submissions_parallel(self, assessments: List['Assessment'], raise_errors: bool = False) -> Dict['Assessment', Optional[BaseException]]:
+        """Fetch the submissions of several assessments concurrently.
+
+        The requests are independent, so wall time is roughly that of the slowest
+        one. The pool never grows past 10 workers, to stay polite to the API.
+
+        Parameters
+        ----------
+        assessments : list of Assessment
+            The assessments whose submissions should be fetched.
+        raise_errors : bool, optional
+            Re-raise the first failed fetch once all of them have finished, default is False.
+
+        Returns
+        -------
+        dict
+            The exception raised while fetching each assessment, or None if it succeeded.
+        """
+        with ThreadPoolExecutor(max_workers=min(10, len(assessments)) or 1) as executor:
+            futures = {assessment: executor.submit(assessment.fetch_submissions) for assessment in assessments}
+        errors = {assessment: future.exception() for assessment, future in futures.items()}
+
+        if raise_errors:
+            for error in errors.values():
+                if error is not None:
+                    raise error
+        return errors
+
+    def _build_score_matrix(self) -> np.ndarray:
+        """Pack the scores of all fetched assessments into one NaN-padded matrix.
+
+        Row `i` holds a copy of the scores of `self.assessments[i]`. The matrix is a
+        temporary for reducing all assessments at once; the assessments keep their
+        own `scores` arrays.
+
+        Returns
+        -------
+        numpy.ndarray
+            A float32 array of shape (number of assessments, most scores in any assessment).
+        """
+        width = max((assessment.scores.size for assessment in self.assessments), default=0)
+        score_matrix = np.full((len(self.assessments), width), np.nan, dtype=np.float32)
+
+        for row, assessment in enumerate(self.assessments):
+            score_matrix[row, :assessment.scores.size] = assessment.scores
+
+        return score_matrix
 
-    def plot_boxplot(self, assessment_label: Optional[List[str]] = None, assessment_name: Optional[List[str]] = None) -> None:
+    def plot_boxplot(self, assessment_label: Optional[Union[str, List[str]]] = None, assessment_name: Optional[Union[str, List[str]]] = None) -> None:
         """Plot boxplots for score distributions of all or specified assessments.
 
         Parameters
         ----------
-        assessment_label : list of str, optional
-            List of assessment labels to include in the plot.
-        assessment_name : list of str, optional
-            List of assessment names to include in the plot.
+        assessment_label : str or list of str, optional
+            The assessment label(s) to include in the plot.
+        assessment_name : str or list of str, optional
+            The assessment name(s) to include in the plot.
         """
+        import altair as alt
+        import pandas as pd
+
         if not self.assessments:
             self.fetch_assessments()
 
-        # Collect data for all or specified assessments
-        data = []
-        for assessment in self.assessments:
-            # Include assessment if it matches either label or name filter
-            if (
-                not assessment_label and not assessment_name  # No filters provided
-                or (assessment_label and assessment.label in assessment_label)  # Label filter matches
-                or (assessment_name and assessment.name in assessment_name)  # Name filter matches
-            ):
-                # Fetch submissions for the assessment
-                assessment.fetch_submissions()
-
-                # Append the scores with assessment metadata
-                data.extend([
-                    {"assessment_name": f"{assessment.name} ({assessment.label})", "score": score}
-                    for score in assessment.scores
-                ])
+        # Summarize each selected assessment in NumPy, so the chart carries five
+        # numbers per assessment plus its outliers instead of every score
+        summaries = []
+        outliers = []
+        selected = self._select_assessments(assessment_label, assessment_name)
+        self._fetch_submissions_parallel(selected, raise_errors=True)
+
+        for assessment in selected:
+            scores = assessment.scores
+            if scores.size == 0:
+                continue
+
+            name = f"{assessment.name} ({assessment.label})"
+            q1, median, q3 = np.percentile(scores, [25, 50, 75])
+
+            # Whiskers reach the most extreme scores within 1.5 IQR of the box,
+            # like Vega-Lite's default boxplot; scores beyond them are outliers
+            iqr = q3 - q1
+            within = scores[(scores >= q1 - 1.5 * iqr) & (scores <= q3 + 1.5 * iqr)]
+            lower, upper = float(within.min()), float(within.max())
+
+            summaries.append({
+                "assessment_name": name,
+                "lower": lower,
+                "q1": float(q1),
+                "median": float(median),
+                "q3": float(q3),
+                "upper": upper,
+            })
+            outliers.extend(
+                {"assessment_name": name, "score": float(score)}
+                for score in scores[(scores < lower) | (scores > upper)]
+            )
 
         # Check if there's data to plot
-        if not data:
+        if not summaries:
             print("No data available to plot.")
             return
 
         # Convert to a DataFrame
-        df = pd.DataFrame(data)
-
-        # Create the Altair boxplot
-        chart = (
-            alt.Chart(df)
-            .mark_boxplot()
-            .encode(
-                y=alt.Y("assessment_name:N", title="Assessments", sort=None),
-                x=alt.X("score:Q", title="Score Percentage", scale=alt.Scale(domain=[0, 100])),
-                color=alt.Color("assessment_name:N", legend=None),  # Optional for differentiation
-                tooltip=["assessment_name", "score"],
-            )
-            .properties(
-                title=f"Score Distribution Across Assessments in {self.course_code}",
-                width=600,
-                height=400,
+        df = pd.DataFrame(summaries)
+
+        # Build the boxplot from the pre-computed statistics
+        y = alt.Y("assessment_name:N", title="Assessments", sort=list(df["assessment_name"]))
+        base = alt.Chart(df).encode(y=y)
+
+        layers = [
+            base.mark_rule().encode(
+                x=alt.X("lower:Q", title="Score Percentage", scale=alt.Scale(domain=[0, 100])),
+                x2="upper:Q",
+            ),
+            base.mark_bar(size=14).encode(
+                x="q1:Q",
+                x2="q3:Q",
+                tooltip=["assessment_name", "lower", "q1", "median", "q3", "upper"],
+            ),
+            base.mark_tick(color="white", size=14).encode(x="median:Q"),
+        ]
+        if outliers:
+            layers.append(
+                alt.Chart(pd.DataFrame(outliers))
+                .mark_point()
+                .encode(y=y, x="score:Q", tooltip=["assessment_name", "score"])
             )
+
+        chart = alt.layer(*layers).properties(
+            title=f"Score Distribution Across Assessments in {self.course_code}",
+            width=600,
+            height=400,
         )
 
         # Display the chart
         chart.display()
             
 
-    def plot_histogram(self, assessment_label: Optional[List[str]] = None, assessment_name: Optional[List[str]] = None, bins: int = 20) -> None:
+    def plot_histogram(self, assessment_label: Optional[Union[str, List[str]]] = None, assessment_name: Optional[Union[str, List[str]]] = None, bins: int = 20) -> None:
         """Plot a layered histogram for score distributions of all or specified assessments.
 
         Parameters
         ----------
-        assessment_label : list of str, optional
-            List of assessment labels to include in the plot.
-        assessment_name : list of str, optional
-            List of assessment names to include in the plot.
+        assessment_label : str or list of str, optional
+            The assessment label(s) to include in the plot.
+        assessment_name : str or list of str, optional
+            The assessment name(s) to include in the plot.
         bins : int, optional
             Number of bins for the histogram, default is 20.
+
+        Raises
+        ------
+        ValueError
+            If `bins` is less than 1.
         """
+        if bins < 1:
+            raise ValueError(f"bins must be at least 1, got {bins}.")
+
+        import altair as alt
+        import pandas as pd
+
         if not self.assessments:
             self.fetch_assessments()
 
         # Collect data for all assessments
-        data = []
-        for assessment in self.assessments:
-            # Include assessment if it matches either label or name filter
-            if (
-                not assessment_label and not assessment_name  # No filters provided
-                or (assessment_label and assessment.label in assessment_label)  # Label filter matches
-                or (assessment_name and assessment.name in assessment_name)  # Name filter matches
-            ):
-
-                assessment.fetch_submissions()
-
-                # Append the scores with assessment metadata
-                data.extend([
-                    {"assessment_name": f"{assessment.name} ({assessment.label})", "score": score}
-                    for score in assessment.scores
-                ])
+        selected = self._select_assessments(assessment_label, assessment_name)
+        self._fetch_submissions_parallel(selected, raise_errors=True)
+        scored = [assessment for assessment in selected if assessment.scores.size]
 
         # Check if there's data to plot
-        if not data:
+        if not scored:
             print("No data available to plot.")
             return
 
-        # Convert to a DataFrame
-        df = pd.DataFrame(data)
-
-        # Create the density curve
-        density_chart = (
+        # Bin each assessment's scores with NumPy over shared edges, so the chart
+        # carries `bins` counts per assessment instead of every score. Scores are
+        # clipped first so bonus credit above 100% lands in the last bin.
+        edges = np.linspace(0, 100, bins + 1)
+        counts = np.stack([
+            np.histogram(np.clip(assessment.scores, 0, 100), bins=edges)[0] for assessment in scored
+        ])
+        names = [f"{assessment.name} ({assessment.label})" for assessment in scored]
+
+        df = pd.DataFrame({
+            "assessment_name": pd.Categorical(np.repeat(names, bins)),
+            "bin_start": np.tile(edges[:-1], len(scored)),
+            "bin_end": np.tile(edges[1:], len(scored)),
+            "count": counts.ravel(),
+        })
+
+        # Overlay the per-assessment histograms
+        histogram_chart = (
             alt.Chart(df)
-            .transform_density(
-                density="score",
-                groupby=["assessment_name"],
-                as_=["score", "density"]
-            )
-            .mark_area(opacity=0.5)
+            .mark_bar(opacity=0.5)
             .encode(
-                x=alt.X("score:Q", title="Score Percentage"),
-                y=alt.Y("density:Q", title="Density", stack=None),
+                x=alt.X("bin_start:Q", bin="binned", title="Score Percentage", scale=alt.Scale(domain=[0, 100])),
+                x2="bin_end:Q",
+                y=alt.Y("count:Q", title="Frequency", stack=None),
                 color=alt.Color("assessment_name:N", title="Assessments"),
+                tooltip=[
+                    alt.Tooltip("assessment_name:N", title="Assessment"),
+                    alt.Tooltip("bin_start:Q", title="Score From"),
+                    alt.Tooltip("bin_end:Q", title="Score To"),
+                    alt.Tooltip("count:Q", title="Frequency"),
+                ]
             )
             .properties(
-                title=f"Density Curve of Scores in {self.course_code}",
+                title=f"Score Distribution of Assessments in {self.course_code}",
                 width=600,
                 height=400,
             )
         )
 
         # Display the chart
-        density_chart.display()
+        histogram_chart.display()
 
 class Assessment:
     """A class to represent an assessment in a course."""
 
-    def __init__(self, assessment_id: int, name: str, label: str, set_name: str, set_heading: str, course_id: int, token: str):
+    _INSTANCES_URL = _API_BASE_URL + "/course_instances/{}/assessments/{}/assessment_instances"
+    _INSTANCE_QUESTIONS_URL = _API_BASE_URL + "/course_instances/{}/assessment_instances/{}/instance_questions"
+
+    __slots__ = (
+        "assessment_id", "name", "label", "set_name", "set_heading", "course_id", "token", "session",
+        "submissions", "scores", "grouped_questions", "_submissions_fetched", "_stats_cache",
+    )
+
+    def __init__(self, assessment_id: int, name: str, label: str, set_name: str, set_heading: str, course_id: int, token: str, session: Optional[_HTTPClient] = None):
         """
         Initialize an Assessment instance.
 
@@ -294,6 +697,8 @@ class Assessment:
             The unique identifier for the course this assessment belongs to.
         token : str
             Authentication token for accessing course data.
+        session : requests.Session or compatible client, optional
+            Client used for this assessment's API requests, default is the shared module session.
         """
         self.assessment_id: int = assessment_id
         self.name: str = name
@@ -302,25 +707,48 @@ class Assessment:
         self.set_heading: str = set_heading
         self.course_id: int = course_id
         self.token: str = token
-        self.submissions: List[Dict] = []
+        self.session: Optional[_HTTPClient] = session
         self.grouped_questions: Dict = {}
+        self.invalidate_submission_cache()
 
-    def fetch_submissions(self) -> None:
-        """Fetch all submissions for this assessment and populate the `scores` list.
+    def invalidate_submission_cache(self) -> None:
+        """Forget the fetched submissions and scores, so the next fetch downloads them again."""
+        self.submissions: List[Dict] = []
+        self.scores: np.ndarray = np.empty(0, dtype=np.float32)
+        self._submissions_fetched: bool = False
+        self._stats_cache: Optional[Dict[str, float]] = None
+
+    def fetch_submissions(self, refresh: bool = False) -> List[Dict]:
+        """Fetch all submissions for this assessment and populate the `submissions` list.
+
+        Submissions are only requested once per instance; later calls return the
+        cached list unless `refresh` is set.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            Re-fetch the submissions even if they were already fetched, default is False.
+
+        Returns
+        -------
+        list of dict
+            The submissions for this assessment.
 
         Raises
         ------
         ValueError
             If the API request fails.
         """
-        url = f"https://us.prairielearn.com/pl/api/v1/course_instances/{self.course_id}/assessments/{self.assessment_id}/assessment_instances"
-        headers = {"Private-Token": self.token}
-        response = requests.get(url, headers=headers)
+        if self._submissions_fetched and not refresh:
+            return self.submissions
+
+        url = self._INSTANCES_URL.format(self.course_id, self.assessment_id)
+        response = _get(url, self.token, self.session, conditional=True)
 
         submissions_list = []
 
         if response.status_code == 200:
-            submissions = response.json()
+            submissions = orjson.loads(response.content)
 
             for submission in submissions:
                 submissions_list.append({
@@ -347,6 +775,13 @@ class Assessment:
             raise ValueError(f"Failed to fetch submissions for assessment {self.name}. Status Code: {response.status_code}")
 
         self.submissions = submissions_list
+        # Keep graded scores as a contiguous float32 array for vectorized statistics
+        self.scores = np.fromiter(
+            (submission['score_perc'] for submission in submissions_list if submission['score_perc'] is not None),
+            dtype=np.float32,
+        )
+        self._submissions_fetched = True
+        self._stats_cache = None
         return submissions_list
 
 
@@ -355,12 +790,10 @@ class Assessment:
         Loops through each submission (assessment instance) and fetches the associated
         instance questions. Returns a flat list of all question features (with the submission metadata added).
         """
-        # If there are no submissions fetched yet, fetch them first.
-        if not self.submissions:
-            self.fetch_submissions()
+        # Fetch submissions first (a no-op if they were already fetched)
+        self.fetch_submissions()
 
         all_question_features = []
-        headers = {"Private-Token": self.token}
 
         for submission in self.submissions:
             assessment_instance_id = submission.get("assessment_instance_id")
@@ -368,10 +801,10 @@ class Assessment:
                 print("Submission missing assessment instance ID")
                 continue
 
-            url = f"https://us.prairielearn.com/pl/api/v1/course_instances/{self.course_id}/assessment_instances/{assessment_instance_id}/instance_questions"
-            response = requests.get(url, headers=headers)
+            url = self._INSTANCE_QUESTIONS_URL.format(self.course_id, assessment_instance_id)
+            response = _get(url, self.token, self.session)
             if response.status_code == 200:
-                questions = response.json()
+                questions = orjson.loads(response.content)
                 # Add submission metadata to each question
                 for question in questions:
                     question["assessment_instance_id"] = assessment_instance_id
@@ -412,76 +845,99 @@ class Assessment:
         self.grouped_questions = grouped
         return grouped
 
-    # def get_summary_statistics(self) -> Dict[str, float]:
-    #     """Compute and return summary statistics for the scores.
-
-    #     Returns
-    #     -------
-    #     dict
-    #         A dictionary containing summary statistics:
-    #         - num_submissions : int
-    #             Number of submissions.
-    #         - mean_score : float
-    #             Average score percentage.
-    #         - median_score : float
-    #             Median score percentage.
-    #         - max_score : float
-    #             Maximum score percentage.
-    #         - min_score : float
-    #             Minimum score percentage.
-        
-    #     Raises
-    #     ------
-    #     ValueError
-    #         If there are no scores available.
-    #     """
-    #     if not self.scores:
-    #         self.fetch_submissions()
-
-    #     if not self.scores:
-    #         return None
-
-    #     return {
-    #         "num_submissions": len(self.scores),
-    #         "mean_score": sum(self.scores) / len(self.scores),
-    #         "median_score": statistics.median(self.scores),
-    #         "max_score": max(self.scores),
-    #         "min_score": min(self.scores),
-    #     }
-
-    # def plot_score_histogram(self) -> None:
-    #     """Plot a histogram of the score percentages using Altair."""
-    #     if not self.scores:
-    #         self.fetch_submissions()
-
-    #     # Create a DataFrame from the scores
-    #     df = pd.DataFrame({"scores": self.scores})
-
-    #     # Create the Altair histogram
-    #     histogram = (
-    #         alt.Chart(df)
-    #         .mark_bar()
-    #         .encode(
-    #             x=alt.X("scores:Q", bin=alt.Bin(maxbins=10), title="Score Percentage"),
-    #             y=alt.Y("count():Q", title="Frequency"),
-    #             tooltip=[
-    #                 alt.Tooltip("scores:Q", title="Score Range"),
-    #                 alt.Tooltip("count():Q", title="Frequency")
-    #             ]
-    #         )
-    #         .properties(
-    #             title=f"Score Distribution for {self.name} (Label: {self.label})",
-    #             width=600,
-    #             height=400
-    #         )
-    #     )
-
-    #     # Display the histogram
-    #     histogram.display()
+    def get_summary_statistics(self) -> Optional[Dict[str, float]]:
+        """Compute and return summary statistics for the scores.
+
+        The statistics are computed once and reused until the submissions are
+        fetched again.
+
+        Returns
+        -------
+        dict or None
+            A dictionary containing summary statistics, or None if there are no scores:
+            - num_submissions : int
+                Number of submissions.
+            - mean_score : float
+                Average score percentage.
+            - median_score : float
+                Median score percentage.
+            - max_score : float
+                Maximum score percentage.
+            - min_score : float
+                Minimum score percentage.
+        """
+        self.fetch_submissions()
+
+        if self._stats_cache is not None:
+            return self._stats_cache
+
+        if self.scores.size == 0:
+            return None
+
+        num_scores = self.scores.size
+        lower, upper = (num_scores - 1) // 2, num_scores // 2
+
+        # A single partition pass places the min, the middle element(s) and the max
+        partitioned = np.partition(self.scores, [0, lower, upper, num_scores - 1])
+
+        self._stats_cache = {
+            "num_submissions": int(num_scores),
+            "mean_score": float(self.scores.mean()),
+            "median_score": float((partitioned[lower] + partitioned[upper]) / 2),
+            "max_score": float(partitioned[-1]),
+            "min_score": float(partitioned[0]),
+        }
+        return self._stats_cache
+
+    def plot_score_histogram(self) -> None:
+        """Plot a histogram of the score percentages using Altair.
+
+        Scores are binned with NumPy into ten fixed bins over 0-100, so the chart
+        only carries the bin counts rather than every individual score.
+        """
+        import altair as alt
+
+        self.fetch_submissions()
+
+        # Clip so bonus credit above 100% is counted in the last bin, not dropped
+        counts, edges = np.histogram(np.clip(self.scores, 0, 100), bins=np.linspace(0, 100, 11))
+
+        # The ten bins are passed as inline records; a DataFrame buys nothing here
+        data = alt.Data(values=[
+            {"bin_start": float(start), "bin_end": float(end), "count": int(count)}
+            for start, end, count in zip(edges[:-1], edges[1:], counts)
+        ])
+
+        # Create the Altair histogram from the pre-binned counts
+        histogram = (
+            alt.Chart(data)
+            .mark_bar()
+            .encode(
+                x=alt.X("bin_start:Q", bin="binned", title="Score Percentage", scale=alt.Scale(domain=[0, 100])),
+                x2="bin_end:Q",
+                y=alt.Y("count:Q", title="Frequency"),
+                tooltip=[
+                    alt.Tooltip("bin_start:Q", title="Score From"),
+                    alt.Tooltip("bin_end:Q", title="Score To"),
+                    alt.Tooltip("count:Q", title="Frequency"),
+                ]
+            )
+            .properties(
+                title=f"Score Distribution for {self.name} (Label: {self.label})",
+                width=600,
+                height=400
+            )
+        )
+
+        # Display the histogram
+        histogram.display()
 
 
 class Student:
     """A class to represent a student."""
+
+    # Slots instead of a per-instance __dict__; a course can hold thousands of students
+    __slots__ = ("user_id", "user_name", "user_uid", "token", "courses", "_course_set", "grades")
     
     def __init__(self, user_id: int, user_name: str, user_uid: str, token: str):
         """
@@ -503,6 +959,7 @@ class Student:
         self.user_uid: str = user_uid
         self.token: str = token
         self.courses: List['Course'] = []
+        self._course_set: Set['Course'] = set()
         self.grades: List[Dict[str, Union[str, int, float]]] = []
 
     def add_course(self, course: 'Course') -> None:
@@ -513,7 +970,8 @@ class Student:
         course : Course
             The course to add to the student's list.
         """
-        if course not in self.courses:
+        if course not in self._course_set:
+            self._course_set.add(course)
             self.courses.append(course)
 
     def list_courses(self) -> None:
@@ -541,32 +999,12 @@ class Student:
         """
         grades = []
         for course in self.courses:
-            url = f"https://us.prairielearn.com/pl/api/v1/course_instances/{course.course_id}/gradebook"
-            headers = {"Private-Token": self.token}
-            response = requests.get(url, headers=headers)
+            # The course downloads its gradebook once and shares it between students
+            course.get_gradebook()
 
-            if response.status_code == 200:
-                gradebook_data = response.json()
-                student_data = next((student for student in gradebook_data if student["user_id"] == self.user_id), None)
-
-                if student_data:
-                    for assessment in student_data["assessments"]:
-
-                        grades.append({
-                            "course_code": course.course_code,
-                            "course_id": course.course_id,
-                            "points": assessment["points"],
-                            "max_points": assessment["max_points"],
-                            "score_perc": assessment["score_perc"],
-                            "start_date": assessment["start_date"],
-                            "duration_seconds": assessment["duration_seconds"],
-                            "assessment_id": assessment["assessment_id"],
-                            "assessment_name": assessment["assessment_name"],
-                            "assessment_label": assessment["assessment_label"],
-                        })
+            for assessment in course._gradebook_by_user.get(self.user_id, []):
 
-            else:
-                raise ValueError(f"Failed to fetch gradebook for course {course.course_id}. Status Code: {response.status_code}")
+                grades.append(_grade_record(course, assessment))
 
         print(f"Successfully fetched all grades for student {self.user_name} (ID: {self.user_id})")
         self.grades = grades
@@ -587,6 +1025,9 @@ class Student:
         ValueError
             If no grades are available for the specified filters.
         """
+        import altair as alt
+        import pandas as pd
+
         if not self.grades:
             self.fetch_all_grades()
 
@@ -595,10 +1036,14 @@ class Student:
         if isinstance(assessment_label, str):
             assessment_label = [assessment_label]
 
+        # Filter against sets so each membership test is O(1)
+        course_codes = frozenset(course_code) if course_code is not None else None
+        labels = frozenset(assessment_label) if assessment_label is not None else None
+
         grades_to_plot = [
             grade for grade in self.grades
-            if (course_code is None or grade["course_code"] in course_code) and
-            (assessment_label is None or grade["assessment_label"] in assessment_label)
+            if (course_codes is None or grade["course_code"] in course_codes) and
+            (labels is None or grade["assessment_label"] in labels)
         ]
 
         if not grades_to_plot:
@@ -609,11 +1054,17 @@ class Student:
                 filters.append(f"assessment label(s): {', '.join(assessment_label)}")
             raise ValueError(f"No grades found for {', '.join(filters)}.")
 
-        df = pd.DataFrame(grades_to_plot)
+        # Build only the columns the chart uses, column-wise rather than from row dicts
+        df = pd.DataFrame({
+            column: [grade[column] for grade in grades_to_plot]
+            for column in ("course_code", "assessment_name", "assessment_label", "score_perc")
+        })
         df["score_perc"] = df["score_perc"].fillna(0)
-        df["true_assessment_name"] = (
-            df["course_code"] + " - " + df["assessment_name"] + " (" + df["assessment_label"] + ")"
-        )
+        # Format each display name once per grade and store the repeats as a categorical
+        df["true_assessment_name"] = pd.Categorical([
+            f"{grade['course_code']} - {grade['assessment_name']} ({grade['assessment_label']})"
+            for grade in grades_to_plot
+        ])
 
         bars = (
             alt.Chart(df)
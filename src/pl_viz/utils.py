@@ -1,23 +1,55 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from pl_api import Course 
+from .pl_api import Course
 
-def fetch_data(course_ids, token):
+def fetch_data(course_ids, token, max_workers=20, fetch_submissions=False, session=None):
+    """
+    Create a Course for each course ID and fetch its students and assessments.
+
+    The gradebook and assessment requests of every course are independent, so they
+    are issued concurrently from a thread pool; total wall time is roughly that of
+    the slowest request rather than the sum of all of them.
+
+    Args:
+        course_ids (dict): Mapping of course codes to PrairieLearn course instance IDs.
+        token (str): PrairieLearn API token.
+        max_workers (int, optional): Maximum number of requests in flight at once.
+        fetch_submissions (bool, optional): Also fetch the submissions of every assessment
+            in every course, once the assessment lists are known.
+        session (requests.Session, optional): Session, or any client with a requests-style
+            get() such as httpx.Client, used for every request of the created courses.
+            Defaults to the package's shared session.
 
+    Returns:
+        tuple: The (global_courses, global_assessments, global_students) dictionaries.
+    """
     global_students = {}
     global_courses = {}
     global_assessments = {}
 
     for course_code, course_id in course_ids.items():
+        global_courses[course_code] = Course(course_code, course_id, token, session=session)
 
-        course = Course(course_code, course_id, token) 
-        global_courses[course_code] = course
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for course in global_courses.values():
+            futures.append(executor.submit(course.fetch_students, global_students))
+            futures.append(executor.submit(course.fetch_assessments, global_assessments))
+
+        # Re-raise the first failure, if any
+        for future in futures:
+            future.result()
+
+        if fetch_submissions:
+            futures = [
+                executor.submit(assessment.fetch_submissions)
+                for course in global_courses.values()
+                for assessment in course.assessments
+            ]
+            for future in futures:
+                future.result()
 
-        course.fetch_students(global_students)
-        course.fetch_assessments(global_assessments)
-    
     return global_courses, global_assessments, global_students
 
 def find_students(global_students, user_names=None, cwls=None):
@@ -51,10 +83,13 @@ def find_students(global_students, user_names=None, cwls=None):
 
     # Search by user_names
     if user_names:
+        # Index students by name once instead of scanning them for every name
+        students_by_name = defaultdict(list)
+        for student in global_students.values():
+            students_by_name[student.user_name].append(student)
+
         for name in user_names:
-            matches = [
-                student for student in global_students.values() if student.user_name == name
-            ]
+            matches = students_by_name.get(name, [])
             if len(matches) == 1:
                 results[name] = matches[0]
             elif len(matches) > 1:
@@ -66,10 +101,15 @@ def find_students(global_students, user_names=None, cwls=None):
 
     # Search by CWLs
     if cwls:
+        # Index students by UID once; the first student with a UID wins, as before
+        students_by_uid = {}
+        for student in global_students.values():
+            students_by_uid.setdefault(student.user_uid, student)
+
         for cwl in cwls:
             # Construct user_uid from CWL
             user_uid = f"{cwl}@ubc.ca"
-            match = next((student for student in global_students.values() if student.user_uid == user_uid), None)
+            match = students_by_uid.get(user_uid)
             if match:
                 results[cwl] = match
             else:
@@ -0,0 +1,356 @@
+import re
+
+import numpy as np
+import orjson
+import pytest
+
+from pl_viz import pl_api
+from pl_viz.pl_api import Course, Student
+from pl_viz.utils import fetch_data, find_students
+
+
+class FakeResponse:
+    """Minimal stand-in for `requests.Response`."""
+
+    def __init__(self, data, status_code=200, headers=None):
+        self.status_code = status_code
+        self.content = orjson.dumps(data)
+        self.text = self.content.decode()
+        self.headers = headers or {}
+
+
+def submission(user_id, score_perc):
+    """Build an assessment instance record as returned by the API."""
+    return {
+        "points": score_perc, "max_points": 100, "score_perc": score_perc,
+        "user_id": user_id, "group_id": None, "group_name": None, "group_uids": None,
+        "user_name": f"Student {user_id}", "user_role": "Student",
+        "start_date": None, "modified_at": None, "highest_score": True,
+        "duration_seconds": 60, "assessment_instance_id": user_id,
+        "assessment_instance_number": 1,
+    }
+
+
+ASSESSMENTS = [
+    {"assessment_id": assessment_id, "assessment_name": f"A{assessment_id}",
+     "assessment_label": f"L{assessment_id}", "assessment_set_name": "Quiz",
+     "assessment_set_heading": "Quizzes"}
+    for assessment_id in (1, 2, 3)
+]
+
+GRADEBOOK = [
+    {"user_id": user_id, "user_name": user_name, "user_uid": f"{cwl}@ubc.ca", "assessments": [
+        {"assessment_id": 1, "assessment_name": "A1", "assessment_label": "L1",
+         "points": 8, "max_points": 10, "score_perc": 80, "start_date": None, "duration_seconds": 60},
+    ]}
+    for user_id, user_name, cwl in ((1, "Ada", "ada"), (2, "Bo", "bo1"), (3, "Bo", "bo2"))
+]
+
+SCORES = {
+    1: [10, 20, 30],
+    2: [40, 50, 60],
+    3: [70, 80, 90],
+}
+
+
+class FakeAPI:
+    """Answer API requests from in-memory data and record every requested URL."""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append((url, headers))
+        if url.endswith("/gradebook"):
+            return FakeResponse(GRADEBOOK)
+        if url.endswith("/assessments"):
+            # Answer revalidations of the assessment list with 304 Not Modified
+            if headers.get("If-None-Match") == '"v1"':
+                return FakeResponse(None, status_code=304)
+            return FakeResponse(ASSESSMENTS, headers={"ETag": '"v1"'})
+        if url.endswith("/instance_questions"):
+            return FakeResponse([{"question_id": 1, "assessment_instance_id": 1}], headers={"ETag": '"q1"'})
+        match = re.search(r"/assessments/(\d+)/assessment_instances$", url)
+        if match:
+            assessment_id = int(match.group(1))
+            if assessment_id in self.failing:
+                return FakeResponse(None, status_code=500)
+            return FakeResponse([
+                submission(user_id, score) for user_id, score in enumerate(SCORES[assessment_id], start=1)
+            ])
+        return FakeResponse(None, status_code=404)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Route the shared session to a fake API and start with empty caches."""
+    fake = FakeAPI()
+    monkeypatch.setattr(pl_api._SESSION, "get", fake.get)
+    pl_api.invalidate_cache()
+    yield fake
+    pl_api.invalidate_cache()
+
+
+@pytest.fixture
+def course(api):
+    """A course with its three assessments fetched."""
+    course = Course("CPSC 100", 1, "token")
+    course.fetch_assessments()
+    return course
+
+
+def test_summary_statistics_after_failed_refetch(api, course, capsys):
+    """A failed re-fetch must not shift the statistics of later assessments."""
+    course.get_assessment_summary_statistics()
+    course.invalidate_submission_cache()
+    api.failing.add(1)
+    capsys.readouterr()
+
+    course.get_assessment_summary_statistics()
+    report = capsys.readouterr().out
+
+    a1, a2, a3 = report.split("\nAssessment: ")[1:]
+    assert "Could not fetch submissions" in a1
+    assert "Mean score: 50.00%" in a2
+    assert "Min score: 40.00%" in a2
+    assert "Mean score: 80.00%" in a3
+    assert "Max score: 90.00%" in a3
+
+
+def test_invalidate_submission_cache_drops_stale_scores(api, course):
+    """After invalidation a failed re-fetch leaves no old scores behind."""
+    assessment = course.assessments[0]
+    assessment.fetch_submissions()
+    course.invalidate_submission_cache()
+    api.failing.add(1)
+
+    with pytest.raises(ValueError):
+        assessment.fetch_submissions()
+    assert assessment.submissions == []
+    assert assessment.scores.size == 0
+
+
+def test_select_assessments_accepts_single_strings(course):
+    """A single label or name selects that assessment, not its characters."""
+    assert [a.label for a in course._select_assessments(assessment_label="L1")] == ["L1"]
+    assert [a.name for a in course._select_assessments(assessment_name="A2")] == ["A2"]
+    assert [a.label for a in course._select_assessments(["L1", "L3"])] == ["L1", "L3"]
+
+
+def test_not_modified_replays_cached_response(api):
+    """A 304 reply to a revalidation returns the earlier 200 response."""
+    first = pl_api._get(pl_api._API_BASE_URL + "/course_instances/1/assessments", "token", conditional=True)
+    second = pl_api._get(pl_api._API_BASE_URL + "/course_instances/1/assessments", "token", conditional=True)
+
+    assert api.calls[1][1]["If-None-Match"] == '"v1"'
+    assert second is first
+    assert second.status_code == 200
+    assert orjson.loads(second.content) == ASSESSMENTS
+
+
+def test_question_responses_are_not_kept_for_revalidation(api, course):
+    """Per-submission question responses are not stored in the ETag cache."""
+    course.assessments[0].fetch_submission_questions()
+
+    assert any("instance_questions" in url for url, _ in api.calls)
+    assert all("instance_questions" not in url for url, _ in pl_api._etag_responses)
+
+
+def test_plot_histogram_counts_scores_above_100(api, course, monkeypatch):
+    """Bonus scores above 100% are counted in the last bin rather than dropped."""
+    import altair as alt
+
+    charts = []
+    monkeypatch.setattr(alt.Chart, "display", lambda chart: charts.append(chart))
+    assessment = course.assessments[0]
+    assessment.fetch_submissions()
+    assessment.scores = np.array([50, 100, 110], dtype=np.float32)
+
+    course.plot_histogram(assessment_label=["L1"], bins=10)
+
+    rows = charts[0].data
+    assert rows["count"].sum() == 3
+    assert rows.loc[rows["bin_start"] == 90, "count"].item() == 2
+
+
+def test_plot_score_histogram_counts_scores_above_100(api, course, monkeypatch):
+    """The single-assessment histogram also keeps bonus scores."""
+    import altair as alt
+
+    charts = []
+    monkeypatch.setattr(alt.Chart, "display", lambda chart: charts.append(chart))
+    assessment = course.assessments[0]
+    assessment.fetch_submissions()
+    assessment.scores = np.array([50, 100, 110], dtype=np.float32)
+
+    assessment.plot_score_histogram()
+
+    counts = [row["count"] for row in charts[0].data.values]
+    assert sum(counts) == 3
+    assert counts[-1] == 2
+
+
+def test_injected_client_is_used_and_inherited(api, monkeypatch):
+    """A client passed to Course serves its requests and those of its assessments."""
+    monkeypatch.setattr(pl_api._SESSION, "get", lambda *args, **kwargs: pytest.fail("shared session used"))
+    client = FakeAPI()
+    course = Course("CPSC 100", 1, "token", session=client)
+
+    course.fetch_assessments()
+    course.assessments[0].fetch_submissions()
+
+    assert course.assessments[0].session is client
+    assert [url.rsplit("/", 1)[-1] for url, _ in client.calls] == ["assessments", "assessment_instances"]
+
+
+def test_fetch_submissions_is_memoized(api, course):
+    """Submissions are downloaded once unless a refresh is requested."""
+    assessment = course.assessments[0]
+    assessment.fetch_submissions()
+    assessment.fetch_submissions()
+    assert sum(url.endswith("/assessment_instances") for url, _ in api.calls) == 1
+
+    assessment.fetch_submissions(refresh=True)
+    assert sum(url.endswith("/assessment_instances") for url, _ in api.calls) == 2
+    assert assessment.scores.tolist() == SCORES[1]
+
+
+def test_populate_student_grades_replaces_course_grades(api):
+    """Grades for the course are replaced while grades from other courses are kept."""
+    course = Course("CPSC 100", 1, "token")
+    course.fetch_students()
+    student = course.students[0]
+    student.grades = [
+        {"course_id": 1, "assessment_label": "stale"},
+        {"course_id": 2, "assessment_label": "other"},
+    ]
+
+    course.populate_student_grades()
+
+    assert [grade["assessment_label"] for grade in student.grades] == ["other", "L1"]
+    assert student.grades[1]["score_perc"] == 80
+    assert sum(url.endswith("/gradebook") for url, _ in api.calls) == 1
+
+
+def test_boxplot_summaries(api, course, monkeypatch):
+    """Quartiles, 1.5 IQR whiskers and outliers are computed before plotting."""
+    import altair as alt
+
+    charts = []
+    monkeypatch.setattr(alt.LayerChart, "display", lambda chart: charts.append(chart))
+    assessment = course.assessments[0]
+    assessment.fetch_submissions()
+    assessment.scores = np.array([10, 50, 52, 55, 58, 60, 99], dtype=np.float32)
+
+    course.plot_boxplot(assessment_label=["L1"])
+
+    summary = charts[0].layer[0].data.iloc[0]
+    assert (summary["q1"], summary["median"], summary["q3"]) == (51, 55, 59)
+    assert (summary["lower"], summary["upper"]) == (50, 60)
+    assert sorted(charts[0].layer[-1].data["score"]) == [10, 99]
+
+
+def test_find_students_by_name_and_cwl():
+    """Names may match several students; CWLs match at most one."""
+    students = {
+        user_id: Student(user_id, user_name, f"{cwl}@ubc.ca", "token")
+        for user_id, user_name, cwl in ((1, "Ada", "ada"), (2, "Bo", "bo1"), (3, "Bo", "bo2"))
+    }
+
+    by_name = find_students(students, user_names=["Ada", "Bo", "Cy"])
+    assert by_name["Ada"] is students[1]
+    assert by_name["Bo"] == [students[2], students[3]]
+    assert by_name["Cy"] is None
+
+    by_cwl = find_students(students, cwls="bo2")
+    assert by_cwl == {"bo2": students[3]}
+
+
+def test_summary_statistics_leave_assessment_scores_alone(api, course):
+    """Printing the course report does not tie the assessments' scores to the matrix."""
+    course.get_assessment_summary_statistics()
+
+    for assessment in course.assessments:
+        assert assessment.scores.flags.owndata
+        assert assessment.scores.tolist() == SCORES[assessment.assessment_id]
+
+
+@pytest.mark.parametrize("bins", [0, -5])
+def test_plot_histogram_rejects_invalid_bins(course, bins):
+    """A bin count below one is reported instead of drawing an empty chart."""
+    with pytest.raises(ValueError, match="bins"):
+        course.plot_histogram(bins=bins)
+
+
+@pytest.mark.parametrize("scores", [[30, 10, 20], [40, 10, 30, 20], [7.5, 7.5, 100, 0, 55]])
+def test_summary_statistics_match_numpy(course, scores):
+    """The partition-based median agrees with np.median for odd and even counts."""
+    assessment = course.assessments[0]
+    assessment.fetch_submissions()
+    assessment.scores = np.array(scores, dtype=np.float32)
+    assessment._stats_cache = None
+
+    stats = assessment.get_summary_statistics()
+
+    assert stats["num_submissions"] == len(scores)
+    assert stats["median_score"] == pytest.approx(np.median(scores))
+    assert stats["mean_score"] == pytest.approx(np.mean(scores))
+    assert (stats["min_score"], stats["max_score"]) == (min(scores), max(scores))
+
+
+def test_fetch_data_shares_registries_across_courses(api):
+    """Courses fetched concurrently share one instance per student and assessment."""
+    courses, assessments, students = fetch_data({"CPSC 100": 1, "CPSC 200": 2}, "token")
+
+    assert sorted(students) == [1, 2, 3]
+    assert sorted(assessments) == [1, 2, 3]
+    for student in students.values():
+        assert {course.course_code for course in student.courses} == {"CPSC 100", "CPSC 200"}
+    assert courses["CPSC 100"].students == courses["CPSC 200"].students
+    assert all(a is b for a, b in zip(courses["CPSC 100"].assessments, courses["CPSC 200"].assessments))
+
+
+def test_fetch_data_fetches_submissions(api):
+    """With fetch_submissions every assessment's submissions are downloaded once."""
+    _, assessments, _ = fetch_data({"CPSC 100": 1}, "token", fetch_submissions=True)
+
+    for assessment in assessments.values():
+        assert assessment.scores.tolist() == SCORES[assessment.assessment_id]
+    assert sum(url.endswith("/assessment_instances") for url, _ in api.calls) == 3
+
+
+def test_bootstrap_fetches_students_and_assessments(api):
+    """Bootstrapping fills both the students and the assessments of the course."""
+    course = Course("CPSC 100", 1, "token")
+    students, assessments = {}, {}
+
+    course.bootstrap(students, assessments)
+
+    assert [student.user_id for student in course.students] == [1, 2, 3]
+    assert [assessment.assessment_id for assessment in course.assessments] == [1, 2, 3]
+    assert sorted(students) == sorted(assessments) == [1, 2, 3]
+    assert sorted(url.rsplit("/", 1)[-1] for url, _ in api.calls) == ["assessments", "gradebook"]
+
+
+def test_fetch_all_grades_reuses_course_gradebook(api):
+    """Students of one course share its gradebook instead of each downloading it."""
+    course = Course("CPSC 100", 1, "token")
+    course.fetch_students()
+
+    for student in course.students:
+        grades = student.fetch_all_grades()
+        assert [(grade["course_code"], grade["score_perc"]) for grade in grades] == [("CPSC 100", 80)]
+    assert sum(url.endswith("/gradebook") for url, _ in api.calls) == 1
+
+
+def test_get_gradebook_is_memoized(api):
+    """The gradebook is downloaded once unless a refresh is requested."""
+    course = Course("CPSC 100", 1, "token")
+
+    first = course.get_gradebook()
+    assert course.get_gradebook() is first
+    assert sum(url.endswith("/gradebook") for url, _ in api.calls) == 1
+
+    course.get_gradebook(refresh=True)
+    assert sum(url.endswith("/gradebook") for url, _ in api.calls) == 2